@@ -5,8 +5,12 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import functools
+import sys
 import unittest
-from typing import cast, Dict, Iterator
+from dataclasses import dataclass
+from typing import Callable, cast, Dict, Iterator
+from unittest.mock import patch
 
 import torch
 from torch import distributed as dist, nn
@@ -15,14 +19,22 @@ from torch.distributed import launcher
 from torch.utils.data import DataLoader
 from torch.utils.data.distributed import DistributedSampler
 from torchtnt.framework._loop_utils import (
-    _is_done,
-    _is_epoch_done,
+    _compile_is_done,
+    _compile_is_epoch_done,
+    _func_requires_iterator,
+    _log_api_usage,
+    _logged_entry_points,
+    _loop_limit,
     _maybe_set_distributed_sampler_epoch,
+    _module_train_mode,
     _reset_module_training_mode,
     _set_module_training_mode,
     _step_requires_iterator,
 )
 from torchtnt.framework._test_utils import generate_random_dataset
+from torchtnt.framework._unit_utils import (
+    _step_requires_iterator as _unit_step_requires_iterator,
+)
 from torchtnt.framework.state import State
 from torchtnt.utils.progress import Progress
 from torchtnt.utils.test_utils import get_pet_launch_config
@@ -57,6 +69,28 @@ class LoopUtilsTest(unittest.TestCase):
         )
         assert sampler.epoch == 20
 
+    def test_maybe_set_distributed_sampler_epoch_duck_typed(self) -> None:
+        class EpochSampler:
+            def __init__(self) -> None:
+                self.epoch = 0
+
+            def set_epoch(self, epoch: int) -> None:
+                self.epoch = epoch
+
+        class CustomDataLoader:
+            def __init__(self) -> None:
+                self.sampler = EpochSampler()
+
+        dataloader = CustomDataLoader()
+        _maybe_set_distributed_sampler_epoch(dataloader, 3)
+        self.assertEqual(dataloader.sampler.epoch, 3)
+
+        # dataloaders whose sampler has no set_epoch are left untouched
+        _maybe_set_distributed_sampler_epoch(
+            DataLoader(generate_random_dataset(10, 3)), 1
+        )
+        _maybe_set_distributed_sampler_epoch([1, 2, 3], 1)
+
     def test_set_module_training_mode(self) -> None:
         """
         Test _set_module_training_mode
@@ -75,8 +109,7 @@ class LoopUtilsTest(unittest.TestCase):
         self.assertFalse(module.training)
         self.assertFalse(loss_fn.training)
 
-        self.assertTrue(prior_module_train_states["module"])
-        self.assertTrue(prior_module_train_states["loss_fn"])
+        self.assertEqual(prior_module_train_states, [(module, True), (loss_fn, True)])
 
         # set back to True
         prior_module_train_states = _set_module_training_mode(tracked_modules, True)
@@ -84,8 +117,7 @@ class LoopUtilsTest(unittest.TestCase):
         self.assertTrue(module.training)
         self.assertTrue(loss_fn.training)
 
-        self.assertFalse(prior_module_train_states["module"])
-        self.assertFalse(prior_module_train_states["loss_fn"])
+        self.assertEqual(prior_module_train_states, [(module, False), (loss_fn, False)])
 
     def test_reset_module_training_mode(self) -> None:
         """
@@ -106,11 +138,65 @@ class LoopUtilsTest(unittest.TestCase):
         self.assertFalse(loss_fn.training)
 
         # set back to True using reset
-        _reset_module_training_mode(tracked_modules, prior_module_train_states)
+        _reset_module_training_mode(prior_module_train_states)
 
         self.assertTrue(module.training)
         self.assertTrue(loss_fn.training)
 
+    def test_set_module_training_mode_sets_submodules(self) -> None:
+        """
+        Test _set_module_training_mode sets the whole subtree, even if the
+        top-level module is already in the requested mode
+        """
+        model = nn.Sequential(nn.Linear(1, 1)).eval()
+        # modules attached after model.eval() default to training mode
+        model.append(nn.Dropout())
+        self.assertFalse(model.training)
+        self.assertTrue(model[1].training)
+
+        tracked_modules: Dict[str, torch.nn.Module] = {"model": model}
+
+        prior_module_train_states = _set_module_training_mode(tracked_modules, False)
+        self.assertTrue(all(not m.training for m in model.modules()))
+
+        _reset_module_training_mode(prior_module_train_states)
+        self.assertTrue(all(not m.training for m in model.modules()))
+
+    def test_module_train_mode(self) -> None:
+        module = nn.Linear(1, 1)
+        eval_module = nn.Linear(1, 1).eval()
+
+        tracked_modules: Dict[str, torch.nn.Module] = {
+            "module": module,
+            "eval_module": eval_module,
+        }
+
+        with _module_train_mode(tracked_modules, False):
+            self.assertFalse(module.training)
+            self.assertFalse(eval_module.training)
+
+        self.assertTrue(module.training)
+        self.assertFalse(eval_module.training)
+
+        # prior modes are restored even if the loop raises
+        with self.assertRaises(RuntimeError):
+            with _module_train_mode(tracked_modules, True):
+                self.assertTrue(eval_module.training)
+                raise RuntimeError("loop failed")
+
+        self.assertTrue(module.training)
+        self.assertFalse(eval_module.training)
+
+    def test_log_api_usage_once(self) -> None:
+        _logged_entry_points.discard("test_entry_point")
+        with patch.object(torch._C, "_log_api_usage_once") as log_api_usage_once:
+            _log_api_usage("test_entry_point")
+            _log_api_usage("test_entry_point")
+
+        log_api_usage_once.assert_called_once_with(
+            "torchtnt.framework.test_entry_point"
+        )
+
     def test_step_func_requires_iterator(self) -> None:
         class Foo:
             def bar(self, state: State, data: object) -> object:
@@ -127,37 +213,112 @@ class LoopUtilsTest(unittest.TestCase):
         self.assertFalse(_step_requires_iterator(foo.bar))
         self.assertTrue(_step_requires_iterator(foo.baz))
         self.assertTrue(_step_requires_iterator(dummy))
+        self.assertTrue(_step_requires_iterator(functools.partial(dummy, 1)))
 
-    def test_is_done(self) -> None:
+    def test_step_func_requires_iterator_decorated(self) -> None:
+        def decorator(func: Callable[..., object]) -> Callable[..., object]:
+            @functools.wraps(func)
+            def wrapper(*args: object, **kwargs: object) -> object:
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        @decorator
+        def dummy(state: State, data: Iterator[str]) -> None:
+            pass
+
+        # inspect does not follow the wrapper to the ``data`` annotation
+        self.assertEqual(
+            _step_requires_iterator(dummy), _unit_step_requires_iterator(dummy)
+        )
+        self.assertFalse(_step_requires_iterator(dummy))
+
+    def test_step_func_requires_iterator_cached(self) -> None:
+        class Foo:
+            def baz(self, state: State, data: Iterator[torch.Tensor]) -> object:
+                pass
+
+        foo = Foo()
+        _func_requires_iterator.cache_clear()
+
+        self.assertTrue(_step_requires_iterator(foo.baz))
+        self.assertTrue(_step_requires_iterator(Foo().baz))
+
+        # bound methods of the same function share a single cache entry
+        cache_info = _func_requires_iterator.cache_info()
+        self.assertEqual(cache_info.misses, 1)
+        self.assertEqual(cache_info.hits, 1)
+
+        # only plain functions are cached, so partials do not pin their arguments
+        self.assertTrue(_step_requires_iterator(functools.partial(foo.baz)))
+        self.assertEqual(_func_requires_iterator.cache_info().currsize, 1)
+
+    def test_step_func_requires_iterator_unhashable(self) -> None:
+        @dataclass
+        class Step:
+            scale: float
+
+            def __call__(self, state: State, data: Iterator[torch.Tensor]) -> None:
+                pass
+
+        self.assertTrue(_step_requires_iterator(Step(1.0)))
+
+    def test_loop_limit(self) -> None:
+        self.assertEqual(_loop_limit(None), sys.maxsize)
+        self.assertEqual(_loop_limit(0), 0)
+        self.assertEqual(_loop_limit(5), 5)
+
+    def test_compile_is_done(self) -> None:
         p = Progress(
             num_epochs_completed=2,
             num_steps_completed=100,
             num_steps_completed_in_epoch=5,
         )
 
-        self.assertTrue(_is_done(p, max_epochs=2, max_steps=200))
-        self.assertTrue(_is_done(p, max_epochs=2, max_steps=None))
-        self.assertTrue(_is_done(p, max_epochs=3, max_steps=100))
-        self.assertTrue(_is_done(p, max_epochs=None, max_steps=100))
+        self.assertTrue(_compile_is_done(max_epochs=2, max_steps=200)(p))
+        self.assertTrue(_compile_is_done(max_epochs=2, max_steps=None)(p))
+        self.assertTrue(_compile_is_done(max_epochs=3, max_steps=100)(p))
+        self.assertTrue(_compile_is_done(max_epochs=None, max_steps=100)(p))
 
-        self.assertFalse(_is_done(p, max_epochs=3, max_steps=200))
-        self.assertFalse(_is_done(p, max_epochs=None, max_steps=200))
-        self.assertFalse(_is_done(p, max_epochs=3, max_steps=None))
-        self.assertFalse(_is_done(p, max_epochs=None, max_steps=None))
+        self.assertFalse(_compile_is_done(max_epochs=3, max_steps=200)(p))
+        self.assertFalse(_compile_is_done(max_epochs=None, max_steps=200)(p))
+        self.assertFalse(_compile_is_done(max_epochs=3, max_steps=None)(p))
+        self.assertFalse(_compile_is_done(max_epochs=None, max_steps=None)(p))
+        self.assertIs(_compile_is_done(max_epochs=2, max_steps=None)(p), True)
 
-    def test_is_epoch_done(self) -> None:
+    def test_compile_is_epoch_done(self) -> None:
         p = Progress(
             num_epochs_completed=2,
             num_steps_completed=100,
             num_steps_completed_in_epoch=5,
         )
 
-        self.assertTrue(_is_epoch_done(p, max_steps_per_epoch=5, max_steps=200))
-        self.assertTrue(_is_epoch_done(p, max_steps_per_epoch=5, max_steps=None))
-        self.assertTrue(_is_epoch_done(p, max_steps_per_epoch=100, max_steps=100))
-        self.assertTrue(_is_epoch_done(p, max_steps_per_epoch=None, max_steps=100))
+        self.assertTrue(_compile_is_epoch_done(max_steps_per_epoch=5, max_steps=200)(p))
+        self.assertTrue(
+            _compile_is_epoch_done(max_steps_per_epoch=5, max_steps=None)(p)
+        )
+        self.assertTrue(
+            _compile_is_epoch_done(max_steps_per_epoch=100, max_steps=100)(p)
+        )
+        self.assertTrue(
+            _compile_is_epoch_done(max_steps_per_epoch=None, max_steps=100)(p)
+        )
+
+        self.assertFalse(
+            _compile_is_epoch_done(max_steps_per_epoch=6, max_steps=200)(p)
+        )
+        self.assertFalse(
+            _compile_is_epoch_done(max_steps_per_epoch=None, max_steps=200)(p)
+        )
+        self.assertFalse(
+            _compile_is_epoch_done(max_steps_per_epoch=6, max_steps=None)(p)
+        )
+        self.assertFalse(
+            _compile_is_epoch_done(max_steps_per_epoch=None, max_steps=None)(p)
+        )
 
-        self.assertFalse(_is_epoch_done(p, max_steps_per_epoch=6, max_steps=200))
-        self.assertFalse(_is_epoch_done(p, max_steps_per_epoch=None, max_steps=200))
-        self.assertFalse(_is_epoch_done(p, max_steps_per_epoch=6, max_steps=None))
-        self.assertFalse(_is_epoch_done(p, max_steps_per_epoch=None, max_steps=None))
+        # progress is read on every call rather than captured at compile time
+        is_epoch_done = _compile_is_epoch_done(max_steps_per_epoch=6, max_steps=None)
+        self.assertFalse(is_epoch_done(p))
+        p.increment_step()
+        self.assertTrue(is_epoch_done(p))
@@ -5,6 +5,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import unittest
 from unittest.mock import patch
 
@@ -46,6 +47,17 @@ class ProgressTest(unittest.TestCase):
         self.assertEqual(new_progress.num_steps_completed, 8)
         self.assertEqual(new_progress.num_steps_completed_in_epoch, 4)
 
+    def test_progress_slots(self) -> None:
+        progress = Progress(
+            num_epochs_completed=2,
+            num_steps_completed=8,
+            num_steps_completed_in_epoch=4,
+        )
+        self.assertFalse(hasattr(progress, "__dict__"))
+
+        progress_copy = copy.deepcopy(progress)
+        self.assertEqual(progress_copy.state_dict(), progress.state_dict())
+
     def test_estimated_steps_in_epoch(self) -> None:
 
         input_dim = 2
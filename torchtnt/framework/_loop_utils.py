@@ -5,9 +5,23 @@
 # LICENSE file in the root directory of this source tree.
 
 import collections
+import contextlib
+import functools
 import inspect
 import logging
-from typing import Callable, Dict, Iterable, Optional, TypeVar
+import sys
+import types
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import torch
 import torch.nn as nn
@@ -18,23 +32,55 @@ from torchtnt.utils.progress import Progress
 _logger: logging.Logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+# Entry points already reported through ``_log_api_usage``
+_logged_entry_points: Set[str] = set()
+
 
 # Helper functions common across the loops
-def _is_done(
-    progress: Progress, max_epochs: Optional[int], max_steps: Optional[int]
-) -> bool:
-    return (max_steps is not None and progress.num_steps_completed >= max_steps) or (
-        max_epochs is not None and progress.num_epochs_completed >= max_epochs
-    )
+def _loop_limit(limit: Optional[int]) -> int:
+    """Normalizes an optional loop limit so that ``None`` (no limit) becomes ``sys.maxsize``.
+
+    This lets the loop termination checks below skip the ``None`` checks on every step.
+    """
+    return sys.maxsize if limit is None else limit
+
+
+def _compile_is_done(
+    max_epochs: Optional[int], max_steps: Optional[int]
+) -> Callable[[Progress], bool]:
+    """Returns a predicate checking whether the loop is done.
+
+    The loop limits are invariant for the duration of the loop, so they are
+    normalized once and bound to the returned closure.
+    """
+    epoch_limit = _loop_limit(max_epochs)
+    step_limit = _loop_limit(max_steps)
+
+    def is_done(progress: Progress) -> bool:
+        # both comparisons are cheap, so combine them without branching
+        return (progress.num_steps_completed >= step_limit) | (
+            progress.num_epochs_completed >= epoch_limit
+        )
+
+    return is_done
 
 
-def _is_epoch_done(
-    progress: Progress, max_steps_per_epoch: Optional[int], max_steps: Optional[int]
-) -> bool:
-    return (max_steps is not None and progress.num_steps_completed >= max_steps) or (
-        max_steps_per_epoch is not None
-        and progress.num_steps_completed_in_epoch >= max_steps_per_epoch
-    )
+def _compile_is_epoch_done(
+    max_steps_per_epoch: Optional[int], max_steps: Optional[int]
+) -> Callable[[Progress], bool]:
+    """Returns a predicate checking whether the current epoch is done.
+
+    See :func:`_compile_is_done`.
+    """
+    epoch_step_limit = _loop_limit(max_steps_per_epoch)
+    step_limit = _loop_limit(max_steps)
+
+    def is_epoch_done(progress: Progress) -> bool:
+        return (progress.num_steps_completed >= step_limit) | (
+            progress.num_steps_completed_in_epoch >= epoch_step_limit
+        )
+
+    return is_epoch_done
 
 
 def _maybe_set_distributed_sampler_epoch(
@@ -44,37 +90,53 @@ def _maybe_set_distributed_sampler_epoch(
     """Set epoch of distributed sampler in dataloader, if applicable.
     See: https://pytorch.org/docs/stable/data.html#torch.utils.data.distributed.DistributedSampler
     """
-    # Set current training epoch for any DistributedSampler in dataloader
-    if isinstance(dataloader, torch.utils.data.DataLoader) and isinstance(
-        dataloader.sampler,
-        torch.utils.data.distributed.DistributedSampler,
-    ):
-        dataloader.sampler.set_epoch(current_epoch)
+    # Set current training epoch for any sampler in dataloader which supports it.
+    # This is duck-typed so that custom samplers and dataloaders are supported too.
+    sampler = getattr(dataloader, "sampler", None)
+    set_epoch = getattr(sampler, "set_epoch", None)
+    if callable(set_epoch):
+        set_epoch(current_epoch)
 
 
 def _set_module_training_mode(
     modules: Dict[str, nn.Module], mode: bool
-) -> Dict[str, bool]:
-    """Returns states to allow for a reset at the end of the loop."""
-    prior_module_train_states = {}
-    for name, module in modules.items():
-        prior_module_train_states[name] = module.training
+) -> List[Tuple[nn.Module, bool]]:
+    """Returns (module, prior training mode) pairs to allow for a reset at the end of the loop."""
+    prior_module_train_states = [
+        (module, module.training) for module in modules.values()
+    ]
+    for module, _ in prior_module_train_states:
         module.train(mode)
     return prior_module_train_states
 
 
-def _reset_module_training_mode(
-    modules: Dict[str, nn.Module], prior_modes: Dict[str, bool]
-) -> None:
+def _reset_module_training_mode(prior_modes: List[Tuple[nn.Module, bool]]) -> None:
     # Reset training mode for modules at the end of the epoch
     # This ensures that side-effects made by the loop are reset before
     # returning back to the user
-    for name, module in modules.items():
-        if name in prior_modes:
-            module.train(prior_modes[name])
+    for module, prior_mode in prior_modes:
+        module.train(prior_mode)
+
+
+@contextlib.contextmanager
+def _module_train_mode(modules: Dict[str, nn.Module], mode: bool) -> Iterator[None]:
+    """Sets the training mode of modules for the duration of a loop.
+
+    Each module's prior training mode is restored on exit, including when the loop
+    raises, so that side-effects made by the loop are reset before returning back
+    to the user.
+    """
+    prior_module_train_states = _set_module_training_mode(modules, mode)
+    try:
+        yield
+    finally:
+        _reset_module_training_mode(prior_module_train_states)
 
 
 def _log_api_usage(entry_point: str) -> None:
+    if entry_point in _logged_entry_points:
+        return
+    _logged_entry_points.add(entry_point)
     torch._C._log_api_usage_once(f"torchtnt.framework.{entry_point}")
 
 
@@ -85,8 +147,27 @@ def _step_requires_iterator(step_func: Callable[[State, T], object]) -> bool:
 
     This is closely tied to the Unit's corresponding step function signature.
     """
-    argspec = inspect.getfullargspec(step_func)
-    annotations = argspec.annotations
+    # bound methods are recreated on every attribute access, so key the cache on
+    # the underlying function to avoid re-inspecting the signature (and holding
+    # references to the unit) each time the loop starts
+    func = getattr(step_func, "__func__", step_func)
+    if isinstance(func, types.FunctionType):
+        return _func_requires_iterator(func)
+    # other callables, e.g. partials or callable instances, would keep whatever
+    # they reference alive in the cache, so inspect them on every call
+    return _func_requires_iterator.__wrapped__(func)
+
+
+@functools.lru_cache(maxsize=None)
+def _func_requires_iterator(func: Callable[..., object]) -> bool:
+    # only the annotation of ``data`` is needed, so read it directly from plain
+    # functions rather than building the full argspec via inspect. Decorated
+    # functions carry the wrapped function's annotations, which getfullargspec
+    # does not follow, so they still go through inspect to match _unit_utils
+    if isinstance(func, types.FunctionType) and not hasattr(func, "__wrapped__"):
+        annotations = func.__annotations__
+    else:
+        annotations = inspect.getfullargspec(func).annotations
     if "data" not in annotations:
         _logger.warning(
             f"Expected step function to have an annotated argument named ``data``. Found {annotations}."
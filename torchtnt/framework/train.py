@@ -11,12 +11,11 @@ import torch
 from pyre_extensions import none_throws
 from torchtnt.framework._callback_handler import CallbackHandler
 from torchtnt.framework._loop_utils import (
-    _is_done,
-    _is_epoch_done,
+    _compile_is_done,
+    _compile_is_epoch_done,
     _log_api_usage,
     _maybe_set_distributed_sampler_epoch,
-    _reset_module_training_mode,
-    _set_module_training_mode,
+    _module_train_mode,
 )
 from torchtnt.framework.callback import Callback
 from torchtnt.framework.evaluate import _evaluate_impl
@@ -130,31 +129,21 @@ def _train_impl(
     # Set all modules to train() mode
     # access modules made available through AppStateMixin
     tracked_modules = train_unit.tracked_modules()
-    prior_module_train_states = _set_module_training_mode(tracked_modules, True)
+    with _module_train_mode(tracked_modules, True):
+        train_unit.on_train_start(state)
+        callback_handler.on_train_start(state, train_unit)
 
-    train_unit.on_train_start(state)
-    callback_handler.on_train_start(state, train_unit)
+        is_done = _compile_is_done(train_state.max_epochs, train_state.max_steps)
+        while not (state.should_stop or is_done(train_unit.train_progress)):
+            _train_epoch_impl(state, train_unit, callback_handler)
+            logger.info(
+                "After train epoch, train progress: "
+                f"num_epochs_completed = {train_unit.train_progress.num_epochs_completed}, "
+                f"num_steps_completed = {train_unit.train_progress.num_steps_completed}"
+            )
 
-    while not (
-        state.should_stop
-        or _is_done(
-            train_unit.train_progress, train_state.max_epochs, train_state.max_steps
-        )
-    ):
-        _train_epoch_impl(state, train_unit, callback_handler)
-        logger.info(
-            "After train epoch, train progress: "
-            f"num_epochs_completed = {train_unit.train_progress.num_epochs_completed}, "
-            f"num_steps_completed = {train_unit.train_progress.num_steps_completed}"
-        )
-
-    train_unit.on_train_end(state)
-    callback_handler.on_train_end(state, train_unit)
-
-    # Reset training mode for modules at the end of the epoch
-    # This ensures that side-effects made by the loop are reset before
-    # returning back to the user
-    _reset_module_training_mode(tracked_modules, prior_module_train_states)
+        train_unit.on_train_end(state)
+        callback_handler.on_train_end(state, train_unit)
 
 
 def _train_epoch_impl(
@@ -191,14 +180,10 @@ def _train_epoch_impl(
 
     prev_steps_in_epoch = train_unit.train_progress.num_steps_completed_in_epoch
 
-    while not (
-        state.should_stop
-        or _is_epoch_done(
-            train_unit.train_progress,
-            train_state.max_steps_per_epoch,
-            train_state.max_steps,
-        )
-    ):
+    is_epoch_done = _compile_is_epoch_done(
+        train_state.max_steps_per_epoch, train_state.max_steps
+    )
+    while not (state.should_stop or is_epoch_done(train_unit.train_progress)):
         try:
             with get_timing_context(
                 state, "train.next(data_iter)"
@@ -8,18 +8,79 @@
 from __future__ import annotations
 
 import atexit
+import inspect
 import logging
-from typing import Any, Dict, List, Mapping, Optional, Union
+import time
+from dataclasses import dataclass
+from queue import Empty, Queue
+from threading import Thread
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 import torch.distributed as dist
+from tensorboard.compat.proto.summary_pb2 import Summary, SummaryMetadata
+from tensorboard.compat.proto.tensor_pb2 import TensorProto
 
 from torch.utils.tensorboard import SummaryWriter
 from torchtnt.utils.distributed import get_global_rank, PGWrapper
 from torchtnt.utils.loggers.logger import MetricLogger, Scalar
+from torchtnt.utils.loggers.utils import scalar_to_float
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _WriterCall:
+    """A deferred call to a SummaryWriter method, made from the writer thread."""
+
+    method: str
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+# Events waiting to be written by the writer thread: (tag, value, step, walltime)
+# for scalars, or a deferred SummaryWriter call for all other logs.
+# A ``None`` event tells the writer thread to exit.
+_Event = Optional[Union[Tuple[str, float, int, float], _WriterCall]]
+
+_MAX_QUEUE_SIZE: int = 10000
+_MAX_EVENTS_PER_WRITE: int = 256
+
+# matches the metadata SummaryWriter.add_scalar attaches with new_style=True
+_SCALAR_METADATA: SummaryMetadata = SummaryMetadata(
+    plugin_data=SummaryMetadata.PluginData(plugin_name="scalars")
+)
+
+# logging methods which are replaced with ``_noop`` on ranks that do not log
+_LOG_METHODS: Tuple[str, ...] = (
+    "log",
+    "log_dict",
+    "log_text",
+    "log_hparams",
+    "log_image",
+    "log_images",
+    "log_audio",
+    "log_scalars",
+)
+
+
+def _walltime_index(method: str) -> int:
+    """Returns the position of ``walltime`` among the positional arguments of a
+    SummaryWriter method, not counting ``self``."""
+    parameters = list(inspect.signature(getattr(SummaryWriter, method)).parameters)
+    return parameters.index("walltime") - 1
+
+
+# SummaryWriter methods deferred to the writer thread which take a walltime
+_WALLTIME_INDEX: Dict[str, int] = {
+    method: _walltime_index(method)
+    for method in ("add_text", "add_image", "add_images", "add_audio", "add_scalars")
+}
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    pass
+
+
 class TensorBoardLogger(MetricLogger):
     """
     Simple logger for TensorBoard.
@@ -36,6 +97,16 @@ class TensorBoardLogger(MetricLogger):
         - Logs will be written on rank 0 only
         - Logger must be constructed synchronously *after* initializing the distributed process group.
 
+    Note:
+        Logs are queued and written to the SummaryWriter by a background
+        thread, so serializing and encoding them does not block the training
+        loop. Call ``flush`` or ``close`` to make sure all queued logs are
+        written to disk. Calls made directly on ``writer`` bypass the queue. Image and audio data is encoded on the background
+        thread, so it should not be modified in place after it is logged.
+        Errors from writing text, hparams, images, audio or ``log_scalars``
+        calls, such as an image with an invalid shape, are logged by the
+        background thread rather than raised to the caller.
+
     Args:
         path (str): path to write logs to
         *args: Extra positional arguments to pass to SummaryWriter
@@ -51,6 +122,8 @@ class TensorBoardLogger(MetricLogger):
 
     def __init__(self: TensorBoardLogger, path: str, *args: Any, **kwargs: Any) -> None:
         self._writer: Optional[SummaryWriter] = None
+        self._queue: Queue[_Event] = Queue(maxsize=_MAX_QUEUE_SIZE)
+        self._thread: Optional[Thread] = None
 
         self._rank: int = get_global_rank()
         self._sync_path_to_workers(path)
@@ -60,10 +133,17 @@ class TensorBoardLogger(MetricLogger):
                 f"TensorBoard SummaryWriter instantiated. Files will be stored in: {path}"
             )
             self._writer = SummaryWriter(log_dir=path, *args, **kwargs)
+            self._thread = Thread(
+                target=self._write_events, name="TensorBoardLogger", daemon=True
+            )
+            self._thread.start()
         else:
             logger.debug(
                 f"Not logging metrics on this host because env RANK: {self._rank} != 0"
             )
+            # skip the writer checks entirely on every log call from this rank
+            for method in _LOG_METHODS:
+                setattr(self, method, _noop)
 
         atexit.register(self.close)
 
@@ -83,8 +163,104 @@ class TensorBoardLogger(MetricLogger):
             logger.info(f"Updating TensorBoard path to match rank 0: {updated_path}")
         self._path: str = updated_path
 
+    def _write_events(self: TensorBoardLogger) -> None:
+        """Drains the event queue in batches until ``close`` is called."""
+        while True:
+            events = [self._queue.get()]
+            while len(events) < _MAX_EVENTS_PER_WRITE:
+                try:
+                    events.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            try:
+                self._write_batch([event for event in events if event is not None])
+            except Exception:
+                logger.exception("Failed to write logs to TensorBoard")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+
+            if None in events:
+                return
+
+    def _write_batch(
+        self: TensorBoardLogger,
+        events: List[Union[Tuple[str, float, int, float], _WriterCall]],
+    ) -> None:
+        writer = self._writer
+        if not writer or not events:
+            return
+
+        # Consecutive scalars logged for the same step are written as a single
+        # Summary proto, rather than one Summary and event record per scalar.
+        # The record uses the walltime at which the first of them was logged.
+        file_writer = writer._get_file_writer()
+        values: List[Summary.Value] = []
+        values_step = 0
+        values_walltime = 0.0
+        for event in events:
+            if isinstance(event, _WriterCall):
+                if values:
+                    file_writer.add_summary(
+                        Summary(value=values), values_step, values_walltime
+                    )
+                    values = []
+                # a bad call, e.g. an image with the wrong shape, must not
+                # drop the rest of the batch
+                try:
+                    getattr(writer, event.method)(*event.args, **event.kwargs)
+                except Exception:
+                    logger.exception(
+                        f"Failed to write {event.method} call to TensorBoard"
+                    )
+                continue
+
+            name, data, step, walltime = event
+            if values and step != values_step:
+                file_writer.add_summary(
+                    Summary(value=values), values_step, values_walltime
+                )
+                values = []
+            if not values:
+                values_step = step
+                values_walltime = walltime
+            values.append(
+                Summary.Value(
+                    tag=name,
+                    tensor=TensorProto(float_val=[data], dtype="DT_FLOAT"),
+                    metadata=_SCALAR_METADATA,
+                )
+            )
+
+        if values:
+            file_writer.add_summary(Summary(value=values), values_step, values_walltime)
+
+    def _enqueue_call(
+        self: TensorBoardLogger,
+        method: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        """Queues a SummaryWriter call for the writer thread.
+
+        If the caller didn't pass ``walltime``, the current time is recorded so the
+        event is stamped with when it was logged rather than when the writer thread
+        writes it.
+        """
+        if len(args) <= _WALLTIME_INDEX[method] and kwargs.get("walltime") is None:
+            kwargs = {**kwargs, "walltime": time.time()}
+        self._queue.put(_WriterCall(method, args, kwargs))
+
     @property
     def writer(self: TensorBoardLogger) -> Optional[SummaryWriter]:
+        """The underlying SummaryWriter, or None on ranks which do not log.
+
+        Calls made directly on the writer, e.g. by ``IterationTimeLogger`` or
+        ``TensorBoardParameterMonitor``, bypass the logger's queue. They are
+        written from the calling thread and are not ordered with respect to
+        logs which are still queued.
+        """
         return self._writer
 
     @property
@@ -102,8 +278,9 @@ class TensorBoardLogger(MetricLogger):
         """
 
         if self._writer:
+            walltime = time.time()
             for k, v in payload.items():
-                self.log(k, v, step)
+                self._queue.put((k, scalar_to_float(v), step, walltime))
 
     def log(self: TensorBoardLogger, name: str, data: Scalar, step: int) -> None:
         """Add scalar data to TensorBoard.
@@ -115,7 +292,7 @@ class TensorBoardLogger(MetricLogger):
         """
 
         if self._writer:
-            self._writer.add_scalar(name, data, global_step=step, new_style=True)
+            self._queue.put((name, scalar_to_float(data), step, time.time()))
 
     def log_text(self: TensorBoardLogger, name: str, data: str, step: int) -> None:
         """Add text data to summary.
@@ -127,7 +304,7 @@ class TensorBoardLogger(MetricLogger):
         """
 
         if self._writer:
-            self._writer.add_text(name, data, global_step=step)
+            self._enqueue_call("add_text", (name, data), {"global_step": step})
 
     def log_hparams(
         self: TensorBoardLogger, hparams: Dict[str, Scalar], metrics: Dict[str, Scalar]
@@ -140,7 +317,7 @@ class TensorBoardLogger(MetricLogger):
         """
 
         if self._writer:
-            self._writer.add_hparams(hparams, metrics)
+            self._queue.put(_WriterCall("add_hparams", (hparams, metrics), {}))
 
     def log_image(self: TensorBoardLogger, *args: Any, **kwargs: Any) -> None:
         """Add image data to TensorBoard.
@@ -150,9 +327,8 @@ class TensorBoardLogger(MetricLogger):
             *args (Any): Positional arguments passed to SummaryWriter.add_image
             **kwargs(Any): Keyword arguments passed to SummaryWriter.add_image
         """
-        writer = self._writer
-        if writer:
-            writer.add_image(*args, **kwargs)
+        if self._writer:
+            self._enqueue_call("add_image", args, kwargs)
 
     def log_images(self: TensorBoardLogger, *args: Any, **kwargs: Any) -> None:
         """Add batched image data to summary.
@@ -161,9 +337,8 @@ class TensorBoardLogger(MetricLogger):
             *args (Any): Positional arguments passed to SummaryWriter.add_images
             **kwargs(Any): Keyword arguments passed to SummaryWriter.add_images
         """
-        writer = self._writer
-        if writer:
-            writer.add_images(*args, **kwargs)
+        if self._writer:
+            self._enqueue_call("add_images", args, kwargs)
 
     def log_audio(self: TensorBoardLogger, *args: Any, **kwargs: Any) -> None:
         """Add audio data to TensorBoard.
@@ -172,9 +347,8 @@ class TensorBoardLogger(MetricLogger):
             *args (Any): Positional arguments passed to SummaryWriter.add_audio
             **kwargs (Any): Keyword arguments passed to SummaryWriter.add_audio
         """
-        writer = self._writer
-        if writer:
-            writer.add_audio(*args, **kwargs)
+        if self._writer:
+            self._enqueue_call("add_audio", args, kwargs)
 
     def log_scalars(
         self: TensorBoardLogger,
@@ -193,17 +367,23 @@ class TensorBoardLogger(MetricLogger):
             None
         """
         if self._writer:
-            self._writer.add_scalars(
-                main_tag=main_tag,
-                tag_scalar_dict=tag_scalar_dict,
-                global_step=global_step,
-                walltime=walltime,
+            self._enqueue_call(
+                "add_scalars",
+                (),
+                {
+                    "main_tag": main_tag,
+                    "tag_scalar_dict": tag_scalar_dict,
+                    "global_step": global_step,
+                    "walltime": walltime,
+                },
             )
 
     def flush(self: TensorBoardLogger) -> None:
         """Writes pending logs to disk."""
 
         if self._writer:
+            # wait for the writer thread to drain queued logs
+            self._queue.join()
             self._writer.flush()
 
     def close(self: TensorBoardLogger) -> None:
@@ -212,5 +392,9 @@ class TensorBoardLogger(MetricLogger):
         """
 
         if self._writer:
+            self._queue.put(None)
+            if self._thread:
+                self._thread.join()
+                self._thread = None
             self._writer.close()
             self._writer = None